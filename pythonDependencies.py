@@ -19,14 +19,24 @@ import os
 import sys
 import re
 import ast
+import json
 import argparse
+import functools
 import subprocess
 import importlib.util
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime
 
+try:
+    import importlib.metadata as importlib_metadata
+except ImportError:  # Python < 3.8
+    importlib_metadata = None
+
 # Mapping of module names to package names
 # This dictionary facilitates translation between the name used for importing
 # and the actual package name in PyPI if they differ
+# Keys must be top-level module names, since imports are reduced to the part before the first dot
 MODULE_TO_PACKAGE = {
     'bs4': 'beautifulsoup4',
     'requests_oauthlib': 'requests-oauthlib',
@@ -36,10 +46,8 @@ MODULE_TO_PACKAGE = {
     'flask_wtf': 'Flask-WTF',
     'flask_migrate': 'Flask-Migrate',
     'flask_restful': 'Flask-RESTful',
-    'matplotlib.pyplot': 'matplotlib',
     'sklearn': 'scikit-learn',
     'joblib': 'scikit-learn',
-    'tensorflow.keras': 'tensorflow',
     'dotenv': 'python-dotenv',
     'yaml': 'pyyaml',
     'crypto': 'pycryptodome',
@@ -58,113 +66,416 @@ MODULE_TO_PACKAGE = {
     'pptx': 'python-pptx',
 }
 
+# Modules known to belong to the standard library
+# sys.stdlib_module_names is authoritative on Python 3.10+, the hardcoded list
+# covers the most common modules on older versions
+STDLIB_MODULES = frozenset(getattr(sys, 'stdlib_module_names', ())) | frozenset(sys.builtin_module_names) | {
+    'abc', 'argparse', 'array', 'ast', 'asyncio', 'base64', 'builtins', 'calendar',
+    'collections', 'concurrent', 'contextlib', 'copy', 'csv', 'ctypes', 'datetime',
+    'decimal', 'difflib', 'email', 'enum', 'fileinput', 'fnmatch', 'fractions',
+    'functools', 'gc', 'getopt', 'getpass', 'glob', 'hashlib', 'heapq', 'hmac',
+    'html', 'http', 'importlib', 'inspect', 'io', 'itertools', 'json', 'logging',
+    'math', 'mimetypes', 'multiprocessing', 'netrc', 'numbers', 'operator', 'os',
+    'pathlib', 'pickle', 'platform', 'pprint', 'queue', 'random', 're', 'readline',
+    'reprlib', 'select', 'shlex', 'shutil', 'signal', 'socket', 'sqlite3',
+    'statistics', 'string', 'struct', 'subprocess', 'sys', 'tempfile', 'threading',
+    'time', 'timeit', 'tkinter', 'token', 'tokenize', 'traceback', 'typing',
+    'unittest', 'urllib', 'uuid', 'venv', 'warnings', 'wave', 'weakref',
+    'webbrowser', 'xml', 'xmlrpc', 'zipfile', 'zipimport', 'zlib'
+}
+
+# Common directories that should not be analyzed
+IGNORED_DIRS = frozenset({
+    '.git', '.venv', 'venv', '__pycache__', '.idea', '.vscode', 'node_modules', 'build', 'dist'
+})
+
+# Number of files between two progress updates when not running in verbose mode
+PROGRESS_INTERVAL = 100
+
+# Below this number of files, the cost of starting worker processes outweighs parallel parsing
+PARALLEL_MIN_FILES = 32
+
+# File where the imports of each analyzed file are cached between runs
+# Bump CACHE_VERSION whenever the import extraction changes so stale results are discarded
+CACHE_FILE = '.pythondeps_cache'
+CACHE_VERSION = 2
+
+# Precompiled patterns used when parsing requirements files and package names
+COMMENT_RE = re.compile(r'#.*')
+VERSION_SPECIFIER_RE = re.compile(r'[=<>~!]')
+PACKAGE_NAME_SEPARATOR_RE = re.compile(r'[-_.]+')
+
+# Patterns used to extract imports without building an AST
+# Any non-comment line containing the 'import' keyword
+IMPORT_KEYWORD_LINE_RE = re.compile(rb'(?m)^(?![ \t]*#).*\bimport\b.*$')
+# A complete single-line 'import a, b as c' or 'from a import b, c as d' statement
+SIMPLE_IMPORT_LINE_RE = re.compile(
+    rb'(?m)^[ \t]*(?:'
+    rb'import[ \t]+([\w.]+(?:[ \t]+as[ \t]+\w+)?(?:[ \t]*,[ \t]*[\w.]+(?:[ \t]+as[ \t]+\w+)?)*)'
+    rb'|from[ \t]+([\w.]+)[ \t]+import[ \t]+(?:\*|\w+(?:[ \t]+as[ \t]+\w+)?(?:[ \t]*,[ \t]*\w+(?:[ \t]+as[ \t]+\w+)?)*)'
+    rb')[ \t]*(?:#.*)?\r?$'
+)
+TRIPLE_QUOTED_STRING_RE = re.compile(rb'("""|\'\'\')[\s\S]*?\1')
+IMPORT_ALIAS_RE = re.compile(rb'[ \t]+as[ \t]+\w+')
+
+# AST fields that hold blocks of statements, the only places where imports can appear
+STATEMENT_BLOCK_FIELDS = ('body', 'orelse', 'finalbody', 'handlers', 'cases')
+
+
+def normalize_package_name(name):
+    ####################################################################################################################
+    # NORMALIZES A PACKAGE NAME SO DIFFERENT SPELLINGS MATCH (PEP 503)
+    ####################################################################################################################
+    
+    return PACKAGE_NAME_SEPARATOR_RE.sub('-', name).lower()
+
+
+@functools.lru_cache(maxsize=None)
+def is_standard_library_location(module_name):
+    ####################################################################################################################
+    # CHECKS IF A MODULE IS INSTALLED IN THE STANDARD LIBRARY DIRECTORIES (ONLY NEEDED BEFORE PYTHON 3.10)
+    ####################################################################################################################
+    
+    try:
+        spec = importlib.util.find_spec(module_name)
+        if spec is None:
+            return False
+            
+        # If it has a location
+        if spec.origin:
+            # If it's in the standard library
+            if 'site-packages' not in spec.origin and ('lib' in spec.origin or 'lib-dynload' in spec.origin):
+                return True
+            
+    except (ImportError, AttributeError, ValueError):
+        pass
+        
+    return False
+
+
+class ImportVisitor(ast.NodeVisitor):
+    ####################################################################################################################
+    # COLLECTS THE TOP-LEVEL MODULE NAMES OF ALL IMPORT STATEMENTS IN AN AST
+    ####################################################################################################################
+    
+    def __init__(self):
+        self.imports = set()
+
+    def visit_Import(self, node):
+        # Capture 'import x' and 'import x as y'
+        for name in node.names:
+            # Get the main module (before the first dot)
+            self.imports.add(name.name.split('.')[0])
+
+    def visit_ImportFrom(self, node):
+        # Capture 'from x import y' and 'from x import y as z'
+        if node.level == 0 and node.module:  # Not a relative import
+            # Get the main module
+            self.imports.add(node.module.split('.')[0])
+
+    def generic_visit(self, node):
+        # Imports are statements, so only the blocks of statements of compound statements
+        # (modules, functions, classes, if, for, while, with, try, match...) need to be visited,
+        # leaving out simple statements and expression subtrees entirely
+        for field in STATEMENT_BLOCK_FIELDS:
+            for child in getattr(node, field, ()):
+                self.visit(child)
+
+
+def extract_simple_imports(data):
+    ####################################################################################################################
+    # EXTRACTS THE IMPORTS OF A FILE WITH REGULAR EXPRESSIONS, MUCH FASTER THAN BUILDING AN AST
+    # RETURNS NONE IF THE FILE CONTAINS IMPORTS THAT CAN ONLY BE ANALYZED RELIABLY WITH AN AST
+    ####################################################################################################################
+    
+    # Files without the 'import' keyword cannot import anything
+    if b'import' not in data:
+        return set()
+    
+    import_lines = IMPORT_KEYWORD_LINE_RE.findall(data)
+    
+    # Imports mentioned inside docstrings or other multi-line strings are not real imports
+    if b'"""' in data or b"'''" in data:
+        stripped = TRIPLE_QUOTED_STRING_RE.sub(b'', data)
+        
+        # A leftover delimiter means the quotes could not be paired (e.g. a '"""' inside a comment
+        # or a regular string), so the strings cannot be told apart from the code without the AST
+        if b'"""' in stripped or b"'''" in stripped:
+            return None
+        
+        if len(IMPORT_KEYWORD_LINE_RE.findall(stripped)) != len(import_lines):
+            return None
+    
+    # Every line mentioning 'import' must be a simple single-line statement
+    # (parenthesized, continued or one-liner 'try: import x' imports need the AST)
+    matches = SIMPLE_IMPORT_LINE_RE.findall(data)
+    if len(matches) != len(import_lines):
+        return None
+    
+    imports = set()
+    
+    for import_names, from_module in matches:
+        if import_names:
+            # Capture 'import x' and 'import x as y'
+            for name in IMPORT_ALIAS_RE.sub(b'', import_names).split(b','):
+                # Get the main module (before the first dot)
+                imports.add(name.strip().split(b'.')[0].decode('ascii'))
+        
+        # Capture 'from x import y', skipping relative imports
+        elif not from_module.startswith(b'.'):
+            # Get the main module
+            imports.add(from_module.split(b'.')[0].decode('ascii'))
+    
+    return imports
+
+
+def extract_imports(file_path):
+    ####################################################################################################################
+    # EXTRACTS ALL IMPORTS FROM A PYTHON FILE (MODULE LEVEL SO IT CAN RUN IN WORKER PROCESSES)
+    # RETURNS NONE IF THE FILE COULD NOT BE ANALYZED
+    ####################################################################################################################
+    
+    try:
+        with open(file_path, 'rb') as file:
+            data = file.read()
+        
+        # Try the fast regex extraction first and only build the AST when it is not reliable
+        imports = extract_simple_imports(data)
+        
+        # Files handled by the regex (including files without any import) are never parsed,
+        # so syntax errors are only reported for the files that take the AST path
+        if imports is None:
+            try:
+                # Parse the raw bytes, the parser handles the encoding declaration itself
+                # The defaults are already the cheapest option: type comments are not collected and
+                # the running interpreter's grammar is used (feature_version would also break Python < 3.8)
+                tree = ast.parse(data, filename=file_path)
+            except SyntaxError as e:
+                print(f"Syntax error in {file_path}: {e}")
+                return None
+            
+            visitor = ImportVisitor()
+            visitor.visit(tree)
+            imports = visitor.imports
+        
+        # Filter out any empty strings
+        imports = {imp for imp in imports if imp}
+        return imports
+        
+    except Exception as e:
+        print(f"Error analyzing {file_path}: {e}")
+        return None
+
 
 class DependenciesManager:
     ####################################################################################################################
     # DEPENDENCIES MANAGER FOR PYTHON PROJECTS
     ####################################################################################################################
     
-    def __init__(self, project_dir='.', requirements_file='requirements.txt'):
+    def __init__(self, project_dir='.', requirements_file='requirements.txt', verbose=False):
         self.project_dir = os.path.abspath(project_dir)
+        self.verbose = verbose
         self.requirements_file = os.path.join(self.project_dir, requirements_file)
+        self.cache_file = os.path.join(self.project_dir, CACHE_FILE)
         self.module_to_package = MODULE_TO_PACKAGE
+        self._installed = self._load_installed_packages()
+        self._local_modules = self._find_local_modules()
 
-    def extract_imports_from_file(self, file_path):
+    def _load_installed_packages(self):
         ####################################################################################################################
-        # EXTRACTS ALL IMPORTS FROM A PYTHON FILE
+        # BUILDS A {NORMALIZED_NAME: VERSION} MAP OF ALL INSTALLED DISTRIBUTIONS IN A SINGLE SCAN
         ####################################################################################################################
         
+        if importlib_metadata is None:
+            return None
+        
         try:
-            with open(file_path, 'r', encoding='utf-8') as file:
+            installed = {}
+            for dist in importlib_metadata.distributions():
                 try:
-                    tree = ast.parse(file.read(), filename=file_path)
-                except SyntaxError as e:
-                    print(f"Syntax error in {file_path}: {e}")
-                    return set()
-            
-            imports = set()
-            
-            for node in ast.walk(tree):
-                # Capture 'import x' and 'import x as y'
-                if isinstance(node, ast.Import):
-                    for name in node.names:
-                        # Get the main module (before the first dot)
-                        module_name = name.name.split('.')[0]
-                        imports.add(module_name)
+                    name = dist.metadata.get('Name')
+                    version = dist.version
+                except Exception:
+                    # Skip only the distribution with unreadable metadata (e.g. not UTF-8)
+                    continue
                 
-                # Capture 'from x import y' and 'from x import y as z'
-                elif isinstance(node, ast.ImportFrom):
-                    if node.level == 0 and node.module:  # Not a relative import
-                        # Get the main module
-                        module_name = node.module.split('.')[0]
-                        imports.add(module_name)
+                # Skip broken distributions without a name
+                if name:
+                    installed.setdefault(normalize_package_name(name), version)
+            return installed
+        except Exception:
+            # The installed distributions could not be listed at all, fall back to pip
+            return None
+
+    def _find_local_modules(self):
+        ####################################################################################################################
+        # COLLECTS THE TOP-LEVEL MODULES AND PACKAGES OF THE PROJECT WITH A SINGLE DIRECTORY LISTING
+        ####################################################################################################################
+        
+        local_modules = set()
+        
+        try:
+            with os.scandir(self.project_dir) as entries:
+                for entry in entries:
+                    if entry.is_file() and entry.name.endswith('.py'):
+                        local_modules.add(entry.name[:-3])
+                    # Only directories need an extra check, to see if they are packages
+                    elif entry.is_dir() and os.path.exists(os.path.join(entry.path, "__init__.py")):
+                        local_modules.add(entry.name)
+        except OSError:
+            pass
+        
+        return local_modules
+
+    def extract_imports_from_file(self, file_path):
+        ####################################################################################################################
+        # EXTRACTS ALL IMPORTS FROM A PYTHON FILE
+        ####################################################################################################################
+        
+        imports = extract_imports(file_path)
+        return imports if imports is not None else set()
+
+    def _find_python_files(self):
+        ####################################################################################################################
+        # YIELDS ALL .PY FILES OF THE PROJECT, PRUNING IGNORED DIRECTORIES WITHOUT DESCENDING INTO THEM
+        ####################################################################################################################
+        
+        script_name = os.path.basename(__file__)
+        pending_dirs = [self.project_dir]
+        
+        while pending_dirs:
+            try:
+                # scandir gets the entry type from the directory listing itself, without an extra stat per entry
+                with os.scandir(pending_dirs.pop()) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False):
+                            if entry.name not in IGNORED_DIRS:
+                                pending_dirs.append(entry.path)
+                        # Don't analyze the dependencies script itself
+                        elif entry.name.endswith('.py') and entry.name != script_name:
+                            yield entry.path
+            except OSError:
+                # Unreadable directory, skip it like os.walk does
+                continue
+
+    def _load_cache(self):
+        ####################################################################################################################
+        # LOADS THE CACHED IMPORTS OF THE PREVIOUS RUN AS {PATH: [MTIME_NS, SIZE, IMPORTS]}
+        ####################################################################################################################
+        
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                cache = json.load(f)
+            if cache.get('version') == CACHE_VERSION and isinstance(cache.get('files'), dict):
+                return cache['files']
+        except (OSError, ValueError, KeyError, AttributeError):
+            # Missing or corrupted cache, start from scratch
+            pass
+        
+        return {}
+
+    def _save_cache(self, files):
+        ####################################################################################################################
+        # SAVES THE IMPORTS OF THE ANALYZED FILES FOR THE NEXT RUN
+        ####################################################################################################################
+        
+        try:
+            with open(self.cache_file, 'w', encoding='utf-8') as f:
+                json.dump({'version': CACHE_VERSION, 'files': files}, f)
+        except OSError as e:
+            print(f"Could not write cache file {self.cache_file}: {e}")
+
+    def _extract_imports_from_files(self, file_paths):
+        ####################################################################################################################
+        # EXTRACTS THE IMPORTS OF SEVERAL FILES, ONLY PARSING THE ONES THAT CHANGED SINCE THE LAST RUN
+        ####################################################################################################################
+        
+        cache = self._load_cache()
+        new_cache = {}
+        results = []
+        pending = []
+        
+        for file_path in file_paths:
+            try:
+                stat = os.stat(file_path)
+            except OSError:
+                stat = None
             
-            # Filter out any empty strings
-            imports = {imp for imp in imports if imp}
-            return imports
+            # Reuse the cached imports if the file has not been modified
+            # Entries with an unexpected shape are treated as a cache miss
+            entry = cache.get(file_path)
+            if stat and isinstance(entry, list) and len(entry) == 3 and isinstance(entry[2], list) and \
+                    entry[0] == stat.st_mtime_ns and entry[1] == stat.st_size:
+                results.append(set(entry[2]))
+                new_cache[file_path] = entry
+            else:
+                pending.append((file_path, stat))
+        
+        parsed = self._parse_files([file_path for file_path, _ in pending])
+        
+        for (file_path, stat), imports in zip(pending, parsed):
+            if imports is None:
+                # Files that could not be analyzed are not cached so their errors are reported again
+                results.append(set())
+                continue
             
-        except Exception as e:
-            print(f"Error analyzing {file_path}: {e}")
-            return set()
+            results.append(imports)
+            if stat:
+                new_cache[file_path] = [stat.st_mtime_ns, stat.st_size, sorted(imports)]
+        
+        if new_cache != cache:
+            self._save_cache(new_cache)
+        
+        return results
+
+    def _parse_files(self, file_paths):
+        ####################################################################################################################
+        # PARSES SEVERAL FILES, IN PARALLEL WHEN THERE ARE ENOUGH OF THEM
+        ####################################################################################################################
+        
+        if len(file_paths) >= PARALLEL_MIN_FILES:
+            try:
+                with ProcessPoolExecutor() as executor:
+                    return list(executor.map(extract_imports, file_paths, chunksize=16))
+            except (OSError, ImportError, NotImplementedError, BrokenProcessPool) as e:
+                # Process pools are not available on every platform and workers can die, parse sequentially instead
+                print(f"Parallel analysis not available ({e}), analyzing files sequentially.")
+        
+        return [extract_imports(file_path) for file_path in file_paths]
 
     def is_standard_library(self, module_name):
         ####################################################################################################################
         # CHECKS IF A MODULE BELONGS TO THE PYTHON STANDARD LIBRARY
         ####################################################################################################################
         
-        # First check built-in modules
-        if module_name in sys.builtin_module_names:
+        # First check the known standard library and built-in modules
+        if module_name in STDLIB_MODULES:
             return True
         
         # Then check if it's a local module of the project
-        if os.path.exists(os.path.join(self.project_dir, f"{module_name}.py")):
+        if module_name in self._local_modules:
             return True
-            
-        if os.path.exists(os.path.join(self.project_dir, module_name)) and os.path.isdir(os.path.join(self.project_dir, module_name)):
-            if os.path.exists(os.path.join(self.project_dir, module_name, "__init__.py")):
-                return True
         
-        try:
-            spec = importlib.util.find_spec(module_name)
-            if spec is None:
-                return False
-                
-            # If it has a location
-            if spec.origin:
-                # If it's in the standard library
-                if 'site-packages' not in spec.origin and ('lib' in spec.origin or 'lib-dynload' in spec.origin):
-                    return True
-                
-        except (ImportError, AttributeError, ValueError):
-            pass
-            
-        # List of modules commonly included in the standard library
-        stdlib_modules = {
-            'abc', 'argparse', 'array', 'ast', 'asyncio', 'base64', 'builtins', 'calendar',
-            'collections', 'concurrent', 'contextlib', 'copy', 'csv', 'ctypes', 'datetime',
-            'decimal', 'difflib', 'email', 'enum', 'fileinput', 'fnmatch', 'fractions',
-            'functools', 'gc', 'getopt', 'getpass', 'glob', 'hashlib', 'heapq', 'hmac',
-            'html', 'http', 'importlib', 'inspect', 'io', 'itertools', 'json', 'logging',
-            'math', 'mimetypes', 'multiprocessing', 'netrc', 'numbers', 'operator', 'os',
-            'pathlib', 'pickle', 'platform', 'pprint', 'queue', 'random', 're', 'readline',
-            'reprlib', 'select', 'shlex', 'shutil', 'signal', 'socket', 'sqlite3',
-            'statistics', 'string', 'struct', 'subprocess', 'sys', 'tempfile', 'threading',
-            'time', 'timeit', 'tkinter', 'token', 'tokenize', 'traceback', 'typing',
-            'unittest', 'urllib', 'uuid', 'venv', 'warnings', 'wave', 'weakref',
-            'webbrowser', 'xml', 'xmlrpc', 'zipfile', 'zipimport', 'zlib'
-        }
-        
-        return module_name in stdlib_modules
+        # On Python 3.10+ sys.stdlib_module_names is complete, so there is nothing else to check
+        if sys.version_info >= (3, 10):
+            return False
+        
+        # On older versions, locate the module as a last resort
+        return is_standard_library_location(module_name)
 
     def get_package_version(self, package_name):
         ####################################################################################################################
-        # GETS THE VERSION OF AN INSTALLED PACKAGE USING PIP (STANDARD LIBRARY ONLY)
+        # GETS THE VERSION OF AN INSTALLED PACKAGE (STANDARD LIBRARY ONLY)
         ####################################################################################################################
         
+        # Look up the installed metadata scanned at startup, without spawning a pip process
+        if self._installed is not None:
+            return self._installed.get(normalize_package_name(package_name))
+        
         try:
-            # Use pip to get package info
+            # Fallback for Python < 3.8: use the pip of the running interpreter to get package info
             result = subprocess.run(
-                ['pip', 'show', package_name],
+                [sys.executable, '-m', 'pip', 'show', package_name],
                 capture_output=True, 
                 text=True,
                 check=False  # Don't raise exception if command fails
@@ -190,7 +501,7 @@ class DependenciesManager:
         # Adjust the module name to the package name if necessary
         package_name = self.module_to_package.get(module_name, module_name)
         
-        # Try to get version using pip
+        # Try to get the installed version
         version = self.get_package_version(package_name)
         
         # If version is found, format with >=
@@ -212,27 +523,27 @@ class DependenciesManager:
 
         print("Analyzing Python files to detect imports...")
 
-        # Counter for statistics
-        file_count = 0
+        file_paths = []
 
         # Go through all .py files in the directory and subdirectories
-        for root, dirs, files in os.walk(self.project_dir):
-            # Ignore common directories that should not be analyzed
-            dirs[:] = [d for d in dirs if d not in {'.git', '.venv', 'venv', '__pycache__', '.idea', '.vscode'}]
-
-            for file in files:
-                if file.endswith('.py'):
-                    file_path = os.path.join(root, file)
-                    relative_path = os.path.relpath(file_path, self.project_dir)
-
-                    # Don't analyze the dependencies script itself
-                    if os.path.basename(file_path) == os.path.basename(__file__):
-                        continue
-                    
-                    print(f"  Analyzing: {relative_path}")
-                    file_imports = self.extract_imports_from_file(file_path)
-                    all_imports.update(file_imports)
-                    file_count += 1
+        for file_path in self._find_python_files():
+            file_paths.append(file_path)
+            
+            # Listing every file is slow on large projects, so by default only show periodic progress
+            if self.verbose:
+                print(f"  Analyzing: {os.path.relpath(file_path, self.project_dir)}")
+            elif len(file_paths) % PROGRESS_INTERVAL == 0:
+                sys.stdout.write(f"\r  Found {len(file_paths)} Python files...")
+                sys.stdout.flush()
+
+        if not self.verbose and file_paths:
+            sys.stdout.write(f"\r  Found {len(file_paths)} Python files to analyze.\n")
+
+        # Counter for statistics
+        file_count = len(file_paths)
+
+        for file_imports in self._extract_imports_from_files(file_paths):
+            all_imports.update(file_imports)
 
         if file_count == 0:
             print(f"No Python files found to analyze in {self.project_dir}")
@@ -245,41 +556,39 @@ class DependenciesManager:
             print("No third-party libraries detected in the code.")
             return False
 
-        print(f"\nDetected {len(third_party)} external dependencies:")
+        # Map the modules to their packages, removing duplicates (e.g. sklearn and joblib), and sort them once
+        packages = sorted({self.module_to_package.get(module, module) for module in third_party}, key=str.lower)
 
-        # Get version information
-        requirements = []
-        not_installed_packages = []
+        print(f"\nDetected {len(packages)} external dependencies:")
 
-        for module in sorted(third_party):
-            # Adjust the module name to the package name if necessary
-            package_name = self.module_to_package.get(module, module)
-
-            # Try to get the version if the package is installed
-            version = self.get_package_version(package_name)
+        # Look up each package version once and derive everything else from these entries
+        entries = [(package_name, self.get_package_version(package_name)) for package_name in packages]
+        requirements = [f"{package_name}>={version}" if version else package_name for package_name, version in entries]
+        not_installed_packages = [package_name for package_name, version in entries if not version]
 
+        for req, (_, version) in zip(requirements, entries):
             if version:
-                req = f"{package_name}>={version}"
-                requirements.append(req)
                 print(f"  ✓ {req} (installed)")
             else:
-                requirements.append(package_name)
-                not_installed_packages.append(package_name)
-                print(f"  ! {package_name} (not installed)")
+                print(f"  ! {req} (not installed)")
+
+        # Build the whole requirements.txt content first
+        lines = [
+            "# Automatically generated by pythonDependencies.py\n",
+            f"# Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n",
+            f"# Project: {os.path.basename(self.project_dir)}\n\n",
+        ]
 
-        # Write the requirements.txt file
-        with open(output_file, 'w') as f:
-            f.write("# Automatically generated by pythonDependencies.py\n")
-            f.write(f"# Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-            f.write(f"# Project: {os.path.basename(self.project_dir)}\n\n")
+        if not_installed_packages:
+            lines.append("# WARNING: The following packages were detected in your code but are not installed.\n")
+            lines.append("# Install them and regenerate this file to include version numbers.\n")
+            lines.append("# You can install all dependencies with: pip install -r requirements.txt\n\n")
 
-            if not_installed_packages:
-                f.write("# WARNING: The following packages were detected in your code but are not installed.\n")
-                f.write("# Install them and regenerate this file to include version numbers.\n")
-                f.write("# You can install all dependencies with: pip install -r requirements.txt\n\n")
+        lines.extend(req + "\n" for req in requirements)
 
-            for req in requirements:
-                f.write(req + "\n")
+        # Write the requirements.txt file in a single call
+        with open(output_file, 'w', newline='') as f:
+            f.write("".join(lines))
 
         print(f"\nFile {os.path.relpath(output_file)} successfully generated.")
         print(f"It contains {len(requirements)} dependencies detected in {file_count} Python files.")
@@ -315,7 +624,7 @@ class DependenciesManager:
             packages = []
             for req in requirements:
                 # Remove comments
-                req = re.sub(r'#.*$', '', req).strip()
+                req = COMMENT_RE.sub('', req).strip()
                 if req:  # Skip empty lines
                     packages.append(req)
                     
@@ -329,9 +638,9 @@ class DependenciesManager:
             missing_packages = []
             for package in packages:
                 # Extract base package name (without version)
-                base_package = re.split(r'[=<>~!]', package)[0].strip()
+                base_package = VERSION_SPECIFIER_RE.split(package, 1)[0].strip()
                 
-                # Check using pip (consistent with the rest of the script)
+                # Check the installed version (consistent with the rest of the script)
                 version = self.get_package_version(base_package)
                 
                 if version:
@@ -354,14 +663,14 @@ class DependenciesManager:
             
             print("\nInstalling missing dependencies...")
             success = True
-            for package in missing_packages:
-                try:
-                    print(f"Installing {package}...")
-                    subprocess.check_call(["pip", "install", package])
-                    print(f"✓ {package} successfully installed.")
-                except subprocess.CalledProcessError:
-                    print(f"✗ Error installing {package}. Try installing it manually.")
-                    success = False
+            try:
+                # Install everything in a single pip run so the resolver works only once
+                print(f"Installing {' '.join(missing_packages)}...")
+                subprocess.check_call([sys.executable, "-m", "pip", "install", *missing_packages])
+                print(f"✓ {len(missing_packages)} packages successfully installed.")
+            except subprocess.CalledProcessError:
+                print("✗ Error installing the missing dependencies. Try installing them manually.")
+                success = False
             
             if success:
                 print("\n✅ All missing dependencies have been installed.")
@@ -375,7 +684,7 @@ class DependenciesManager:
             print(f"Error checking dependencies: {e}")
             return False
             
-    def update_dependencies(self):
+    def update_dependencies(self, auto_regenerate=False):
         ####################################################################################################################
         # UPDATES ALL DEPENDENCIES TO THEIR LATEST VERSIONS
         ####################################################################################################################
@@ -397,10 +706,10 @@ class DependenciesManager:
             # Process each line, removing comments and empty lines
             packages = []
             for req in requirements:
-                req = re.sub(r'#.*$', '', req).strip()
+                req = COMMENT_RE.sub('', req).strip()
                 if req:
                     # Extract only the package name (without version)
-                    package_name = re.split(r'[=<>~!]', req)[0].strip()
+                    package_name = VERSION_SPECIFIER_RE.split(req, 1)[0].strip()
                     packages.append(package_name)
                     
             if not packages:
@@ -409,23 +718,31 @@ class DependenciesManager:
                 
             print(f"Updating {len(packages)} packages to their latest versions...")
             
-            # Update each package
-            for package in packages:
-                try:
-                    print(f"Updating {package}...")
-                    subprocess.check_call([
-                        sys.executable, "-m", "pip", "install", "--upgrade", package
-                    ])
-                    print(f"✓ {package} successfully updated.")
-                except subprocess.CalledProcessError:
-                    print(f"✗ Error updating {package}.")
+            # Update all packages in a single pip run
+            try:
+                subprocess.check_call([
+                    sys.executable, "-m", "pip", "install", "--upgrade", *packages
+                ])
+                print(f"✓ {len(packages)} packages successfully updated.")
+            except subprocess.CalledProcessError:
+                print("✗ Error updating the dependencies.")
                     
             print("\nUpdate completed.")
             
+            # Refresh the installed versions so the regenerated file picks up the new ones
+            self._installed = self._load_installed_packages()
+            
             # Regenerate the requirements.txt file with the new versions
-            regenerate = input("Do you want to update the requirements.txt file with the new versions? (y/n): ")
-            if regenerate.lower() in ['y', 'yes']:
+            if auto_regenerate:
                 return self.generate_requirements()
+            
+            # Only ask when someone can answer, so scripted runs never hang waiting for input
+            if sys.stdin and sys.stdin.isatty():
+                regenerate = input("Do you want to update the requirements.txt file with the new versions? (y/n): ")
+                if regenerate.lower() in ['y', 'yes']:
+                    return self.generate_requirements()
+            else:
+                print("Run with --update --yes to also update the requirements.txt file with the new versions.")
                 
             return True
             
@@ -447,8 +764,10 @@ Usage examples:
   python pythonDependencies.py --generate            # Generate requirements.txt
   python pythonDependencies.py --check               # Check and install dependencies
   python pythonDependencies.py --update              # Update dependencies
+  python pythonDependencies.py --update --yes        # Update dependencies and requirements.txt without asking
   python pythonDependencies.py --dir /path/project   # Specify directory
   python pythonDependencies.py --file req-dev.txt    # Use alternative file
+  python pythonDependencies.py --generate --verbose  # Show every analyzed file
         """
     )
     
@@ -462,6 +781,12 @@ Usage examples:
     parser.add_argument('--update', '-u', action='store_true',
                         help='Update dependencies to the latest version')
                         
+    parser.add_argument('--yes', '-y', action='store_true',
+                        help='Update requirements.txt after --update without asking')
+                        
+    parser.add_argument('--verbose', '-v', action='store_true',
+                        help='Show every analyzed file')
+                        
     parser.add_argument('--dir', '-d', type=str, default='.',
                         help='Project directory (default: current directory)')
                         
@@ -472,7 +797,7 @@ Usage examples:
     args = parser.parse_args()
     
     # Create manager instance
-    manager = DependenciesManager(project_dir=args.dir, requirements_file=args.file)
+    manager = DependenciesManager(project_dir=args.dir, requirements_file=args.file, verbose=args.verbose)
     
     # No arguments, show help
     if not any([args.generate, args.check, args.update]):
@@ -487,7 +812,7 @@ Usage examples:
         manager.check_and_install_dependencies()
             
     if args.update:
-        manager.update_dependencies()
+        manager.update_dependencies(auto_regenerate=args.yes)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+####################################################################################################################
+# TESTS FOR PYTHON DEPENDENCIES MANAGER
+####################################################################################################################
+# Run with:
+#    python -m unittest discover tests
+####################################################################################################################
+
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pythonDependencies
+from pythonDependencies import DependenciesManager, extract_imports, extract_simple_imports
+
+
+class ExtractSimpleImportsTest(unittest.TestCase):
+    ####################################################################################################################
+    # REGEX FAST PATH MUST NEVER REPORT IMPORTS THAT ONLY APPEAR INSIDE STRINGS
+    ####################################################################################################################
+
+    # A stray triple quote in a comment shifts the pairing of the following string
+    TRIPLE_QUOTE_IN_COMMENT = b'# Docstrings use """ quotes\nTEMPLATE = """\nimport fakemod\n"""\n'
+
+    # A triple quote inside a regular string shifts the pairing of the following string
+    TRIPLE_QUOTE_IN_STRING = b'SEP = \'"""\'\nTEMPLATE = """\nimport fakemod\n"""\n'
+
+    def assert_no_imports(self, data):
+        # The fast path must give up and let the AST decide
+        self.assertIsNone(extract_simple_imports(data))
+
+        with tempfile.NamedTemporaryFile('wb', suffix='.py', delete=False) as f:
+            f.write(data)
+        try:
+            self.assertEqual(extract_imports(f.name), set())
+        finally:
+            os.remove(f.name)
+
+    def test_triple_quote_in_comment(self):
+        self.assert_no_imports(self.TRIPLE_QUOTE_IN_COMMENT)
+
+    def test_triple_quote_in_string(self):
+        self.assert_no_imports(self.TRIPLE_QUOTE_IN_STRING)
+
+    def test_simple_imports(self):
+        data = b'"""Module docstring"""\nimport os, numpy as np\nfrom bs4 import BeautifulSoup\nfrom . import local\n'
+        self.assertEqual(extract_simple_imports(data), {'os', 'numpy', 'bs4'})
+
+
+class InstalledPackagesTest(unittest.TestCase):
+    ####################################################################################################################
+    # ONE UNREADABLE DISTRIBUTION MUST NOT DISABLE THE WHOLE INSTALLED PACKAGES MAP
+    ####################################################################################################################
+
+    @unittest.skipIf(pythonDependencies.importlib_metadata is None, "importlib.metadata requires Python 3.8+")
+    def test_broken_distribution_is_skipped(self):
+        broken = mock.Mock()
+        type(broken).metadata = mock.PropertyMock(side_effect=UnicodeDecodeError('utf-8', b'\xe9', 0, 1, 'invalid'))
+        good = mock.Mock(metadata={'Name': 'Good_Package'}, version='2.0')
+
+        with mock.patch.object(pythonDependencies.importlib_metadata, 'distributions', return_value=[broken, good]):
+            manager = DependenciesManager(project_dir=tempfile.gettempdir())
+
+        self.assertIsNotNone(manager._installed)
+        self.assertEqual(manager.get_package_version('good-package'), '2.0')
+
+
+if __name__ == "__main__":
+    unittest.main()